@@ -6,15 +6,28 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup, NavigableString, Tag
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selectolax.lexbor import LexborHTMLParser
 import time
 import json
 import re
+import asyncio
+import httpx
 import threading
-from urllib.parse import urljoin, urlparse, quote_plus
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from urllib.parse import urljoin, urlparse, parse_qs, quote_plus
+from urllib.request import urlopen
 import logging
 import atexit
+from html import escape
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,287 +35,616 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
-# Patterns for meaningful text detection
-email_pattern = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
-phone_pattern = re.compile(r'(\+?\d{1,3}[-.\s]?)?(\(?\d{3}\)?[-.\s]?){1,2}\d{4}')
-url_pattern = re.compile(r'https?://[^\s]+')
+# Explicit paths for your VPS
+CHROME_BINARY = "/usr/bin/google-chrome"
+CHROMEDRIVER_PATH = "/usr/bin/chromedriver"
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# One Chrome process shared over CDP, with a pool of tab-bound sessions
+TAB_COUNT = os.cpu_count() or 4
+TAB_TIMEOUT = 60  # Seconds to wait for an idle tab
+PARSE_TIMEOUT = 30  # Seconds to wait for a parse worker to clean a page
+HEALTH_CHECK_TTL = 5.0  # Seconds a tab is trusted without a health check after it last responded
+
+# Subresources no endpoint uses, blocked in every tab over CDP
+# Chrome matches these unanchored (see url_matches_pattern), so *.css also covers style.css?v=1
+BLOCKED_URL_PATTERNS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.woff', '*.woff2', '*.svg', '*.css', '*.mp4', '*.webm']
+
+# /scrape output modes: cleaned content, or the raw <body> markup sliced out without parsing
+SCRAPE_MODES = ('cleaned', 'raw_body')
+
+# True once the document is complete and the load event handlers have run
+PAGE_LOADED_SCRIPT = """
+if (document.readyState !== 'complete' || !document.body) return false;
+const [navigation] = performance.getEntriesByType('navigation');
+return navigation ? navigation.loadEventEnd > 0 : performance.timing.loadEventEnd > 0;
+"""
+
+# Tags removed from scraped pages, contents included, before cleaning
+STRIPPED_TAGS = ['script', 'style', 'noscript', 'template', 'iframe', 'svg']
+
+# DuckDuckGo result containers, as a single CSS selector
+RESULTS_SELECTOR = '[data-testid="result"], .web-result, .result'
+
+# DuckDuckGo specific selectors, tried in order until one matches
+RESULT_SELECTORS = (
+    '[data-testid="result"]',  # Modern DuckDuckGo
+    '.web-result',             # Alternative DuckDuckGo
+    '.result',                 # Fallback
+    'article[data-testid="result"]',
+    '.result__body'
+)
+TITLE_SELECTORS = (
+    'h2 a[data-testid="result-title-a"]',  # Modern DuckDuckGo
+    'h2 a',
+    'h3 a',
+    'a[data-testid="result-title-a"]',
+    '.result__title a',
+    '.result-title a',
+    '.result__a'
+)
+SNIPPET_SELECTORS = (
+    '[data-result="snippet"]',
+    '.result__snippet',
+    '.result-snippet',
+    'div[data-testid="result-snippet"]',
+    '.VwiC3b',
+    '.result__body',
+    'span[data-testid="result-snippet"]'
+)
+
+# Counts the current results, then clicks the first visible and enabled 'more results' button.
+# Tries the known ID and CSS selectors, then multilingual button labels, then any button whose
+# text or ID looks like a 'more results' button. Returns [result_count, description_or_null].
+MORE_RESULTS_SCRIPT = """
+const count = document.querySelectorAll(arguments[0]).length;
+const usable = el => !!el && !el.disabled && el.getClientRects().length > 0;
+const click = (el, description) => { el.click(); return [count, description]; };
+
+const selectors = [
+    '#more-results',
+    'button#more-results',
+    'button[id="more-results"]',
+    'div.rdxznaZygY2CryNa5yzk button',
+    '.rdxznaZygY2CryNa5yzk button',
+    'button.wE5p3MOcL8UVdJhgH3V1'
+];
+for (const selector of selectors) {
+    const el = document.querySelector(selector);
+    if (usable(el)) return click(el, selector);
+}
+
+const buttons = Array.from(document.getElementsByTagName('button')).filter(usable);
+const labels = [
+    'More results',
+    'Davantage de résultats',
+    'Más resultados',
+    'Mehr Ergebnisse',
+    'Più risultati',
+    'Load more',
+    'Show more'
+];
+for (const label of labels) {
+    const el = buttons.find(b => b.textContent.includes(label));
+    if (el) return click(el, `label '${label}'`);
+}
+
+const keywords = ['more', 'davantage', 'más', 'mehr', 'più', 'load', 'show'];
+for (const el of buttons) {
+    const text = el.innerText.toLowerCase();
+    if (keywords.some(k => text.includes(k)) || (el.id || '').includes('more-results')) {
+        return click(el, `text='${text}', id='${el.id}'`);
+    }
+}
+return [count, null];
+"""
+
+# <body> open and close tags, for slicing out the body without parsing
+body_open_pattern = re.compile(r'<body\b', re.IGNORECASE)
+body_close_pattern = re.compile(r'</body\s*>', re.IGNORECASE)
+
+# DuckDuckGo pagination offset query parameter
+offset_pattern = re.compile(r's=(\d+)')
+
+# Email, phone and URL patterns for meaningful text detection, combined into one scan
+meaningful_pattern = re.compile(
+    r'[\w\.-]+@[\w\.-]+\.\w+'
+    r'|(?:\+?\d{1,3}[-.\s]?)?(?:\(?\d{3}\)?[-.\s]?){1,2}\d{4}'
+    r'|https?://[^\s]+'
+)
 
 def is_meaningful_text(text):
-    if email_pattern.search(text):
-        return True
-    if phone_pattern.search(text):
-        return True
-    if url_pattern.search(text):
-        return True
-    # Also consider non-empty text meaningful
-    if text.strip():
-        return True
-    return False
-
-def clean_tag(tag):
-    # If it's a NavigableString, return stripped text
-    if isinstance(tag, NavigableString):
-        text = tag.strip()
-        if text:
-            return text
-        else:
-            return None
+    # Any non-empty text is meaningful, so only scan for patterns when it is blank
+    return bool(text.strip()) or bool(meaningful_pattern.search(text))
 
-    # If it's an <a> tag with mailto or http(s), keep it as is
-    if tag.name == 'a':
-        href = tag.get('href', '')
-        text = tag.get_text(strip=True)
-        if href.startswith('mailto:') or href.startswith('http'):
-            # Return a new <a> tag with href and text
-            new_tag = Tag(name='a')
-            new_tag['href'] = href
-            new_tag.string = text
-            return new_tag
-        else:
-            # Otherwise, just return the text content
-            return text if text else None
+def url_matches_pattern(url, pattern):
+    """Match a URL the way Chrome matches Network.setBlockedURLs patterns"""
+    # Each '*'-separated piece must appear in order anywhere in the URL, nothing is anchored,
+    # so *.gif matches https://www.gifts.com/ as well as logo.gif?v=1
+    position = 0
+    for part in pattern.split('*'):
+        position = url.find(part, position)
+        if position == -1:
+            return False
+        position += len(part)
+    return True
 
-    # For other tags, recursively clean children
-    cleaned_children = []
-    for child in tag.children:
-        cleaned_child = clean_tag(child)
-        if cleaned_child:
-            cleaned_children.append(cleaned_child)
+def wait_for_page_load(driver, timeout=15):
+    """Wait until the page's load event has fired and its handlers have finished"""
+    WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+        lambda d: d.execute_script(PAGE_LOADED_SCRIPT)
+    )
 
-    # Flatten strings and tags into a list of strings or tags
+def node_text(node, separator=''):
+    """Text content of a selectolax node with whitespace collapsed"""
+    # Text nodes are joined with separator; the default keeps inline markup like <b>Py</b>thon whole,
+    # while ' ' keeps separate blocks (<div>a</div><div>b</div>) from running together
+    return ' '.join(node.text(separator=separator).split())
+
+def _append_text(buffer, text):
+    # Keep only non-empty stripped text
+    if text:
+        text = text.strip()
+        if text:
+            buffer.append((False, text))
+
+def _clean_anchor(node):
+    # Keep <a> tags with mailto or http(s), otherwise just their text content
+    href = node.attributes.get('href') or ''
+    text = node.text(deep=True, separator='', strip=True)
+    if href.startswith('mailto:') or href.startswith('http'):
+        return (True, f'<a href="{escape(href)}">{escape(text, quote=False)}</a>')
+    return (False, text) if text else None
+
+def _collapse(buffer):
     # Join consecutive strings with spaces
     result = []
-    buffer = []
-    def flush_buffer():
-        if buffer:
-            result.append(' '.join(buffer))
-            buffer.clear()
-
-    for item in cleaned_children:
-        if isinstance(item, str):
-            buffer.append(item)
+    strings = []
+    for is_markup, fragment in buffer:
+        if is_markup:
+            if strings:
+                result.append((False, ' '.join(strings)))
+                strings = []
+            result.append((True, fragment))
         else:
-            flush_buffer()
-            result.append(item)
-    flush_buffer()
+            strings.append(fragment)
+    if strings:
+        result.append((False, ' '.join(strings)))
 
     # If result is empty, return None
     if not result:
         return None
 
     # If only one item and it's string, return it directly
-    if len(result) == 1 and isinstance(result[0], str):
+    if len(result) == 1 and not result[0][0]:
         return result[0]
 
     # Otherwise, wrap all items in a <section> tag (valid HTML)
-    section = Tag(name='section')
-    for item in result:
-        if isinstance(item, str):
-            # Add text with a space separator
-            if section.contents:
-                section.append(' ')
-            section.append(item)
+    parts = ['<section>']
+    for is_markup, fragment in result:
+        if is_markup:
+            parts.append(fragment)
         else:
-            section.append(item)
-    return section
+            # Add text with a space separator
+            if len(parts) > 1:
+                parts.append(' ')
+            parts.append(escape(fragment, quote=False))
+    parts.append('</section>')
+    return (True, ''.join(parts))
+
+def clean_tag(root):
+    """Return the cleaned HTML of a selectolax node's children, walking the tree without recursion"""
+    # One buffer of (is_markup, fragment) items per open element
+    stack = [[]]
+    parents = [root]
+    node = root.child
+    while True:
+        while node is not None:
+            tag = node.tag
+            if tag == '-text':
+                _append_text(stack[-1], node.text(deep=False))
+            elif tag == 'a':
+                item = _clean_anchor(node)
+                if item:
+                    stack[-1].append(item)
+            elif not tag.startswith('-'):
+                # Descend into the element, skipping comments and other non-element nodes
+                stack.append([])
+                parents.append(node)
+                node = node.child
+                continue
+            node = node.next
+
+        # All of root's children visited
+        if len(parents) == 1:
+            break
+
+        # All children visited, collapse the element into its parent
+        item = _collapse(stack.pop())
+        element = parents.pop()
+        if item:
+            stack[-1].append(item)
+        node = element.next
+
+    # Root's children collapse like any other element's
+    item = _collapse(stack[0])
+    return item[1] if item else ''
+
+def slice_body(html):
+    """Return the raw markup between <body ...> and </body> without parsing the document"""
+    # Search the original string: lower() can change its length for non-ASCII text
+    match = body_open_pattern.search(html)
+    if match is None:
+        return html
+    start = html.find('>', match.end()) + 1
+    end = len(html)
+    for match in body_close_pattern.finditer(html, start):
+        end = match.start()
+    return html[start:end]
+
+def parse_and_clean(html):
+    """Parse a page and return its cleaned HTML (top-level so parse workers can unpickle it)"""
+    tree = LexborHTMLParser(html)
+
+    # Remove <script>, <style> and other non-content tags with their contents
+    tree.strip_tags(STRIPPED_TAGS, recursive=True)
+
+    body = tree.body
+    return clean_tag(body if body is not None else tree.root)
 
 class SingleBrowserManager:
-    def __init__(self):
-        self.driver = None
-        self.lock = threading.Lock()  # Thread safety for shared browser
-        self.setup_driver()
-    
-    def setup_driver(self):
-        """Initialize Chrome WebDriver with appropriate options"""
+    def __init__(self, tab_count=TAB_COUNT):
+        self.tab_count = tab_count
+        self.browser = None  # Chrome process exposing the CDP endpoint
+        self.user_data_dir = None
+        self.debugger_address = None  # host:port of the CDP endpoint, chosen by Chrome
+        self.sessions = []  # Every tab-bound driver session, idle or borrowed
+        self.tabs = queue.Queue()  # Idle tab-bound driver sessions, kept across restarts for waiting requests
+        self.last_ok = {}  # Driver session -> time.monotonic() when it last responded
+        self.retired = {}  # Session borrowed during a restart -> (browser, user_data_dir) it belongs to
+        self.lock = threading.Lock()  # Thread safety for browser setup and restart
+        # The browser is started by setup_driver(), at server start or on the first borrow,
+        # so importing this module (as the parse workers do) never launches Chrome
+
+    def launch_browser(self):
+        """Start the shared Chrome process with a remote debugging endpoint"""
+        # A fresh profile per launch, so a stale DevToolsActivePort is never read
+        if self.user_data_dir:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+        self.user_data_dir = tempfile.mkdtemp(prefix='chrome-cdp-')
+        command = [
+            CHROME_BINARY,
+            # Add options for better performance and stability
+            '--headless=new',  # Chrome 109+ headless mode
+            '--no-sandbox',
+            '--disable-dev-shm-usage',
+            '--disable-gpu',
+            '--window-size=1920,1080',
+            # Pooled tabs all live in one window, so keep background tabs running at full speed
+            '--disable-background-timer-throttling',
+            '--disable-renderer-backgrounding',
+            '--disable-backgrounding-occluded-windows',
+            '--blink-settings=imagesEnabled=false',  # Images are discarded by the cleaners anyway
+            f'--user-agent={USER_AGENT}',
+            '--remote-debugging-port=0',  # Let Chrome pick a free port, never another browser's
+            f'--user-data-dir={self.user_data_dir}',
+            'about:blank'
+        ]
+        self.browser = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        # Wait for Chrome to write the port it picked, then for the CDP endpoint to accept connections
+        active_port_file = os.path.join(self.user_data_dir, 'DevToolsActivePort')
+        deadline = time.monotonic() + 15
+        while time.monotonic() < deadline:
+            if self.browser.poll() is not None:
+                raise RuntimeError(f"Chrome exited during startup with code {self.browser.returncode}")
+            try:
+                with open(active_port_file) as f:
+                    port = f.readline().strip()
+                if port:
+                    address = f"127.0.0.1:{port}"
+                    urlopen(f"http://{address}/json/version", timeout=1).close()
+                    self.debugger_address = address
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError("Chrome remote debugging endpoint did not come up")
+
+    def open_tab(self):
+        """Attach a WebDriver session to the shared browser, bound to a new tab"""
+        # Each session gets its own keep-alive connection to its chromedriver, and a tab is only
+        # used by one request at a time, so the default single-connection pool never queues
         chrome_options = Options()
-        
-        # Add options for better performance and stability
-        chrome_options.add_argument('--headless=new')  # Chrome 109+ headless mode
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-
-        # Explicit paths for your VPS
-        chrome_options.binary_location = "/usr/bin/google-chrome"
-        service = Service("/usr/bin/chromedriver")
+        chrome_options.add_experimental_option('debuggerAddress', self.debugger_address)
+        driver = webdriver.Chrome(service=Service(CHROMEDRIVER_PATH), options=chrome_options)
+        driver.switch_to.new_window('tab')
+        driver.execute_cdp_cmd('Network.enable', {})
+        self.set_resource_blocking(driver, True)
+        return driver
+
+    def set_resource_blocking(self, driver, enabled, page_url=None):
+        """Block (or unblock) image, stylesheet, font and media downloads in a tab"""
+        # Blocking also applies to the navigation itself, so skip patterns matching the page's own URL
+        urls = [pattern for pattern in BLOCKED_URL_PATTERNS
+                if not (page_url and url_matches_pattern(page_url, pattern))] if enabled else []
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': urls})
 
+    def close_tab(self, driver):
+        """Close a tab and detach its WebDriver session (the browser keeps running)"""
         try:
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            logger.info("Chrome WebDriver initialized successfully")
+            driver.close()
+        except:
+            pass
+        try:
+            driver.quit()
+        except:
+            pass
+
+    def setup_driver(self):
+        """Launch the shared browser and open one WebDriver session per tab"""
+        try:
+            self.launch_browser()
+
+            # Warm all tabs in parallel so startup costs one session attach instead of N
+            with ThreadPoolExecutor(max_workers=self.tab_count) as executor:
+                futures = [executor.submit(self.open_tab) for _ in range(self.tab_count)]
+                for future in futures:
+                    try:
+                        driver = future.result()
+                    except Exception as e:
+                        logger.warning(f"Failed to open browser tab: {e}")
+                        continue
+                    self.sessions.append(driver)
+                    self.tabs.put(driver)
+
+            if not self.sessions:
+                raise RuntimeError("No browser tabs could be opened")
+            logger.info(f"Chrome WebDriver initialized successfully with {len(self.sessions)} tabs")
             return True
         except Exception as e:
             logger.error(f"Failed to initialize WebDriver: {e}")
             return False
 
-    
+    def stop_browser(self, browser, user_data_dir):
+        """Stop a Chrome process and delete its profile"""
+        if browser:
+            browser.terminate()
+            try:
+                browser.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                browser.kill()
+        if user_data_dir:
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+
+    def shutdown(self):
+        """Close the idle tab sessions and stop the browser once no request is using it"""
+        sessions, self.sessions = self.sessions, []
+        # Drain the queue rather than replacing it, so requests already waiting on it get the new tabs
+        idle = []
+        while True:
+            try:
+                idle.append(self.tabs.get_nowait())
+            except queue.Empty:
+                break
+        self.last_ok = {}
+        for driver in idle:
+            self.close_tab(driver)
+        # Borrowed tabs are closed by release_tab() when their requests finish, and the last one stops the browser
+        borrowed = [driver for driver in sessions if driver not in idle]
+        for driver in borrowed:
+            self.retired[driver] = (self.browser, self.user_data_dir)
+        if not borrowed:
+            self.stop_browser(self.browser, self.user_data_dir)
+        self.browser = None
+        self.debugger_address = None
+        self.user_data_dir = None
+
     def restart_driver(self):
-        """Restart the WebDriver if needed"""
+        """Restart the browser and all of its tabs"""
         with self.lock:
-            if self.driver:
-                try:
-                    self.driver.quit()
-                except:
-                    pass
+            self.shutdown()
             return self.setup_driver()
-    
-    def is_healthy(self):
-        """Check if the driver is healthy"""
+
+    def is_healthy(self, driver=None):
+        """Check if the browser, or a single tab session, is healthy"""
         try:
-            if self.driver is None:
-                return False
+            if driver is None:
+                return bool(self.sessions) and self.browser is not None and self.browser.poll() is None
             # Try to get current URL to test responsiveness
-            current_url = self.driver.current_url
+            current_url = driver.current_url
             return True
         except:
             return False
-    
-    def get_driver(self):
-        """Get the driver instance with health check"""
-        if not self.is_healthy():
-            logger.warning("Driver is unhealthy, attempting restart...")
-            self.restart_driver()
-        return self.driver
-    
+
+    def reopen_tab(self, driver):
+        """Replace a dead tab session, relaunching the browser if it has exited"""
+        with self.lock:
+            if self.browser is None or self.browser.poll() is not None:
+                self.launch_browser()
+            new_driver = self.open_tab()
+            # A tab from before a restart gets a one-off replacement, closed when it is returned
+            if driver in self.sessions:
+                self.sessions[self.sessions.index(driver)] = new_driver
+            self.release_tab(driver)
+            return new_driver
+
+    def release_tab(self, driver):
+        """Close a session that has left the pool, stopping its retired browser after the last one"""
+        self.last_ok.pop(driver, None)
+        self.close_tab(driver)
+        retired = self.retired.pop(driver, None)
+        if retired and retired not in self.retired.values():
+            self.stop_browser(*retired)
+
+    def run_in_tab(self, operation, timeout=TAB_TIMEOUT):
+        """Run operation(driver) on a borrowed tab, reopening the tab and retrying once if its session fails"""
+        if not self.sessions:
+            with self.lock:
+                # Another request may have started the browser while this one waited
+                if not self.sessions:
+                    logger.warning("No browser tabs available, starting the browser...")
+                    self.shutdown()
+                    self.setup_driver()
+            if not self.sessions:
+                raise RuntimeError("Browser driver is not available")
+
+        driver = self.tabs.get(timeout=timeout)
+        try:
+            # Only ping tabs that haven't responded recently
+            if time.monotonic() - self.last_ok.get(driver, 0.0) >= HEALTH_CHECK_TTL:
+                if not self.is_healthy(driver):
+                    logger.warning("Tab is unhealthy, attempting to reopen it...")
+                    driver = self.reopen_tab(driver)
+            try:
+                result = operation(driver)
+            except TimeoutException:
+                # A slow page, not a dead tab
+                raise
+            except WebDriverException as e:
+                # Unreachable hosts, bad URLs and script errors fail the same way on a fresh tab
+                if self.is_healthy(driver):
+                    raise
+                logger.warning(f"Tab failed mid-request, reopening it and retrying once: {e.msg}")
+                driver = self.reopen_tab(driver)
+                result = operation(driver)
+            self.last_ok[driver] = time.monotonic()
+            return result
+        except Exception:
+            # Re-check the tab on its next borrow
+            self.last_ok.pop(driver, None)
+            raise
+        finally:
+            self.return_tab(driver)
+
+    def return_tab(self, driver):
+        """Return a borrowed driver to the idle queue"""
+        with self.lock:
+            if driver in self.sessions:
+                self.tabs.put(driver)
+            else:
+                # Borrowed before a restart, or a one-off replacement for such a tab
+                self.release_tab(driver)
+
     def close(self):
         """Close the WebDriver"""
         with self.lock:
-            if self.driver:
-                try:
-                    self.driver.quit()
-                    logger.info("WebDriver closed successfully")
-                except Exception as e:
-                    logger.error(f"Error closing WebDriver: {e}")
+            try:
+                self.shutdown()
+                # The server is exiting, so don't wait for tabs still borrowed
+                for driver in list(self.retired):
+                    self.release_tab(driver)
+                logger.info("WebDriver closed successfully")
+            except Exception as e:
+                logger.error(f"Error closing WebDriver: {e}")
 
 class DuckDuckGoScraper:
     def __init__(self, browser_manager):
         self.browser_manager = browser_manager
     
-    def extract_base_url(self, url):
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def extract_base_url(url):
         """Extract base URL from a full URL"""
+        # Fast path for plain http(s) URLs: the host ends at the first '/', '?' or '#'.
+        # urlparse strips tabs and newlines and rejects malformed IPv6 hosts ('[::1')
+        # and hosts that normalize to a separator, so anything else goes through it
+        if url.startswith(('https://', 'http://')) and url.isascii() and not any(c in url for c in '[]\t\r\n'):
+            start = url.index('//') + 2
+            end = len(url)
+            for separator in '/?#':
+                index = url.find(separator, start, end)
+                if index != -1:
+                    end = index
+            return url[:end]
         try:
             parsed = urlparse(url)
             return f"{parsed.scheme}://{parsed.netloc}"
         except:
             return ""
     
-    def extract_results_from_page(self, page_num):
+    def extract_results_from_page(self, driver, page_num):
         """Extract search results from current page"""
         results = []
-        driver = self.browser_manager.get_driver()
         
         # Wait for results to load with longer timeout
         wait = WebDriverWait(driver, 15)
         
         # Wait for search results container with DuckDuckGo specific selectors
         try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="result"], .web-result, .result')))
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, RESULTS_SELECTOR)))
         except TimeoutException:
-            print(f"Timeout waiting for results on page {page_num}")
+            logger.debug(f"Timeout waiting for results on page {page_num}")
             return []
         
-        # DuckDuckGo specific selectors for search results
-        result_selectors = [
-            '[data-testid="result"]',  # Modern DuckDuckGo
-            '.web-result',             # Alternative DuckDuckGo
-            '.result',                 # Fallback
-            'article[data-testid="result"]',
-            '.result__body'
-        ]
+        # Fetch the page URL and markup in one round trip and extract everything locally,
+        # so no WebElement text or attribute lookups are needed per result
+        page_url, html = driver.execute_script("return [location.href, document.documentElement.outerHTML];")
+        tree = LexborHTMLParser(html)
         
+        # DuckDuckGo specific selectors for search results
         result_elements = []
-        for selector in result_selectors:
-            try:
-                result_elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                if result_elements:
-                    print(f"Found {len(result_elements)} elements with selector: {selector}")
-                    break
-            except NoSuchElementException:
-                continue
+        for selector in RESULT_SELECTORS:
+            result_elements = tree.css(selector)
+            if result_elements:
+                logger.debug(f"Found {len(result_elements)} elements with selector: {selector}")
+                break
         
         if not result_elements:
-            print(f"No search results found on page {page_num}")
+            logger.debug(f"No search results found on page {page_num}")
             return []
         
         for i, result in enumerate(result_elements):
             try:
                 # Extract title with DuckDuckGo specific selectors
-                title_selectors = [
-                    'h2 a[data-testid="result-title-a"]',  # Modern DuckDuckGo
-                    'h2 a',
-                    'h3 a',
-                    'a[data-testid="result-title-a"]',
-                    '.result__title a',
-                    '.result-title a',
-                    '.result__a'
-                ]
-                
                 title = ""
                 title_element = None
                 
-                for selector in title_selectors:
-                    try:
-                        title_element = result.find_element(By.CSS_SELECTOR, selector)
-                        title = title_element.text.strip()
+                for selector in TITLE_SELECTORS:
+                    title_element = result.css_first(selector)
+                    if title_element is not None:
+                        title = node_text(title_element)
                         if title:
                             break
-                    except NoSuchElementException:
-                        continue
                 
                 # Skip if no title found
                 if not title:
                     continue
                 
-                # Extract URL
+                # Extract URL, resolved against the page like the DOM href property
                 url = ""
                 base_url = ""
-                if title_element:
-                    try:
-                        url = title_element.get_attribute('href')
-                        if url:
-                            base_url = self.extract_base_url(url)
-                    except:
-                        pass
+                href = title_element.attributes.get('href')
+                if href:
+                    url = urljoin(page_url, href)
+                    base_url = self.extract_base_url(url)
                 
                 # Skip if no URL found
                 if not url:
                     continue
                 
                 # Extract snippet/description with DuckDuckGo specific selectors
-                snippet_selectors = [
-                    '[data-result="snippet"]',
-                    '.result__snippet',
-                    '.result-snippet',
-                    'div[data-testid="result-snippet"]',
-                    '.VwiC3b',
-                    '.result__body',
-                    'span[data-testid="result-snippet"]'
-                ]
-                
                 snippet = ""
-                for selector in snippet_selectors:
-                    try:
-                        snippet_element = result.find_element(By.CSS_SELECTOR, selector)
-                        snippet = snippet_element.text.strip()
+                for selector in SNIPPET_SELECTORS:
+                    snippet_element = result.css_first(selector)
+                    if snippet_element is not None:
+                        snippet = node_text(snippet_element)
                         if snippet:
                             break
-                    except NoSuchElementException:
-                        continue
                 
                 # If no snippet found with specific selectors, try to extract from result text
                 if not snippet:
                     try:
-                        full_text = result.text.strip()
-                        # Remove title from full text to get snippet
-                        if title in full_text:
-                            snippet = full_text.replace(title, "").strip()
-                        else:
-                            snippet = full_text
+                        full_text = node_text(result, separator=' ')
+                        # Keep the text after the title to get snippet
+                        _, found, tail = full_text.partition(title)
+                        snippet = tail.strip() if found else full_text
                         
-                        # Clean up snippet (remove URL if present)
-                        if url in snippet:
-                            snippet = snippet.replace(url, "").strip()
+                        # Clean up snippet (keep the text after the URL if present)
+                        _, found, tail = snippet.partition(url)
+                        if found:
+                            snippet = tail.strip()
                             
                         # Limit snippet length
                         if len(snippet) > 300:
@@ -322,207 +664,283 @@ class DuckDuckGoScraper:
                         "snippet": snippet
                     }
                     results.append(result_data)
-                    print(f"Extracted result {len(results)}: {title[:50]}...")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Extracted result {len(results)}: {title[:50]}...")
             
             except Exception as e:
-                print(f"Error extracting result {i} on page {page_num}: {str(e)}")
+                logger.warning(f"Error extracting result {i} on page {page_num}: {str(e)}")
                 continue
         
         return results
     
-    def navigate_to_next_page(self):
+    def count_results(self, driver):
+        """Count the search results currently on the page"""
+        return len(driver.find_elements(By.CSS_SELECTOR, RESULTS_SELECTOR))
+
+    def wait_for_more_results(self, driver, previous_count, timeout=8):
+        """Wait until more than previous_count results are on the page"""
+        try:
+            WebDriverWait(driver, timeout).until(lambda d: self.count_results(d) > previous_count)
+            return True
+        except TimeoutException:
+            logger.debug(f"No new results loaded within {timeout}s")
+            return False
+
+    def navigate_to_next_page(self, driver):
         """Navigate to the next page of results"""
-        driver = self.browser_manager.get_driver()
-        
         try:
-            # First, try the exact button ID we found
-            try:
-                more_button = driver.find_element(By.ID, "more-results")
-                if more_button and more_button.is_displayed() and more_button.is_enabled():
-                    print("Found 'more-results' button by ID, clicking...")
-                    driver.execute_script("arguments[0].click();", more_button)
-                    time.sleep(4)  # Wait for new results to load
-                    return True
-            except (NoSuchElementException, Exception) as e:
-                print(f"ID selector failed: {str(e)}")
-            
-            # Try CSS selectors for the button
-            css_selectors = [
-                'button#more-results',
-                'button[id="more-results"]',
-                'div.rdxznaZygY2CryNa5yzk button',
-                '.rdxznaZygY2CryNa5yzk button',
-                'button.wE5p3MOcL8UVdJhgH3V1'
-            ]
-            
-            for selector in css_selectors:
-                try:
-                    load_more_button = driver.find_element(By.CSS_SELECTOR, selector)
-                    if load_more_button and load_more_button.is_displayed() and load_more_button.is_enabled():
-                        print(f"Found button with selector: {selector}, clicking...")
-                        driver.execute_script("arguments[0].click();", load_more_button)
-                        time.sleep(4)
-                        return True
-                except (NoSuchElementException, Exception) as e:
-                    print(f"CSS selector {selector} failed: {str(e)}")
-                    continue
-            
-            # Try XPath selectors for multilingual support
-            xpath_selectors = [
-                "//button[@id='more-results']",
-                "//button[contains(text(), 'More results')]",
-                "//button[contains(text(), 'Davantage de résultats')]",
-                "//button[contains(text(), 'Más resultados')]",
-                "//button[contains(text(), 'Mehr Ergebnisse')]",
-                "//button[contains(text(), 'Più risultati')]",
-                "//button[contains(text(), 'Load more')]",
-                "//button[contains(text(), 'Show more')]",
-                "//div[contains(@class, 'rdxznaZygY2CryNa5yzk')]//button"
-            ]
-            
-            for xpath in xpath_selectors:
-                try:
-                    element = driver.find_element(By.XPATH, xpath)
-                    if element and element.is_displayed() and element.is_enabled():
-                        print(f"Found button with XPath: {xpath}, clicking...")
-                        driver.execute_script("arguments[0].click();", element)
-                        time.sleep(4)
-                        return True
-                except (NoSuchElementException, Exception) as e:
-                    print(f"XPath {xpath} failed: {str(e)}")
-                    continue
-            
-            # Try to find any button that might be the "more results" button
+            # Find and click the 'more results' button inside the browser in a single round trip
             try:
-                all_buttons = driver.find_elements(By.TAG_NAME, "button")
-                for button in all_buttons:
-                    button_text = button.text.lower()
-                    button_id = button.get_attribute('id') or ''
-                    
-                    # Check if this looks like a "more results" button
-                    if any(keyword in button_text for keyword in ['more', 'davantage', 'más', 'mehr', 'più', 'load', 'show']) or \
-                       'more-results' in button_id:
-                        if button.is_displayed() and button.is_enabled():
-                            print(f"Found potential more button: text='{button_text}', id='{button_id}', clicking...")
-                            driver.execute_script("arguments[0].click();", button)
-                            time.sleep(4)
-                            return True
+                previous_count, clicked = driver.execute_script(MORE_RESULTS_SCRIPT, RESULTS_SELECTOR)
+                if clicked:
+                    logger.debug(f"Found more results button ({clicked}), clicked")
+                    return self.wait_for_more_results(driver, previous_count)
             except Exception as e:
-                print(f"Button search failed: {str(e)}")
+                logger.debug(f"Button search failed: {str(e)}")
             
             # Try scrolling approach as backup
             try:
-                print("Trying scroll approach...")
+                logger.debug("Trying scroll approach...")
                 initial_height = driver.execute_script("return document.body.scrollHeight")
                 
                 # Scroll to bottom
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(3)
-                
-                # Check if page height increased (indicating new content loaded)
-                new_height = driver.execute_script("return document.body.scrollHeight")
                 
-                if new_height > initial_height:
-                    print("New content loaded via scrolling")
+                # Wait for the page height to increase (indicating new content loaded)
+                try:
+                    WebDriverWait(driver, 3).until(
+                        lambda d: d.execute_script("return document.body.scrollHeight") > initial_height
+                    )
+                    logger.debug("New content loaded via scrolling")
                     return True
+                except TimeoutException:
+                    pass
             except Exception as e:
-                print(f"Scroll approach failed: {str(e)}")
+                logger.debug(f"Scroll approach failed: {str(e)}")
             
             # URL manipulation as last resort
             try:
-                print("Trying URL manipulation...")
+                logger.debug("Trying URL manipulation...")
                 current_url = driver.current_url
                 
                 # DuckDuckGo uses 's=' parameter for pagination offset
                 if 's=' in current_url:
-                    import re
-                    match = re.search(r's=(\d+)', current_url)
+                    match = offset_pattern.search(current_url)
                     if match:
                         current_start = int(match.group(1))
                         new_start = current_start + 30
-                        new_url = re.sub(r's=\d+', f's={new_start}', current_url)
-                        print(f"Navigating to: {new_url}")
+                        new_url = offset_pattern.sub(f's={new_start}', current_url)
+                        logger.debug(f"Navigating to: {new_url}")
                         driver.get(new_url)
-                        time.sleep(4)
                         return True
                 else:
                     separator = '&' if '?' in current_url else '?'
                     new_url = f"{current_url}{separator}s=30"
-                    print(f"Navigating to: {new_url}")
+                    logger.debug(f"Navigating to: {new_url}")
                     driver.get(new_url)
-                    time.sleep(4)
                     return True
             except Exception as e:
-                print(f"URL manipulation failed: {str(e)}")
+                logger.debug(f"URL manipulation failed: {str(e)}")
             
-            print("All pagination methods failed")
+            logger.debug("All pagination methods failed")
             return False
             
         except Exception as e:
-            print(f"Error navigating to next page: {str(e)}")
+            logger.warning(f"Error navigating to next page: {str(e)}")
             return False
     
-    def search_duckduckgo(self, query, max_pages=3):
-        """Search DuckDuckGo and extract results from multiple pages"""
-        driver = self.browser_manager.get_driver()
+    def scrape_pages(self, driver, query, max_pages):
+        """Load the search page in a tab and extract results from multiple pages"""
+        # Navigate to DuckDuckGo
+        clean_query = query.replace('\"','')
+        search_url = f"https://duckduckgo.com/?q={quote_plus(clean_query)}"
+        driver.get(search_url)
         
-        if not driver:
-            return {"error": "Failed to get browser driver"}
+        all_results = []
+        current_page = 1
         
-        try:
-            # Use thread lock to ensure thread safety
-            with self.browser_manager.lock:
-                # Navigate to DuckDuckGo
-                clean_query = query.replace('\"','')
-                search_url = f"https://duckduckgo.com/?q={quote_plus(clean_query)}"
-                driver.get(search_url)
-                
-                all_results = []
-                current_page = 1
-                
-                while current_page <= max_pages:
-                    print(f"Scraping page {current_page}...")
-                    
-                    # Extract results from current page
-                    page_results = self.extract_results_from_page(current_page)
-                    
-                    if not page_results:
-                        print(f"No results found on page {current_page}")
-                        break
-                    
-                    # Update position numbers to be continuous across pages
-                    for result in page_results:
-                        result["position"] = len(all_results) + 1
-                        result["query"] = query
-                        all_results.append(result)
-                    
-                    print(f"Found {len(page_results)} results on page {current_page}")
-                    
-                    # Try to navigate to next page if not on last requested page
-                    if current_page < max_pages:
-                        if not self.navigate_to_next_page():
-                            print(f"Could not navigate to page {current_page + 1}, stopping pagination")
-                            break
-                        
-                        # Wait a bit between page requests to be respectful
-                        time.sleep(1)
-                    
-                    current_page += 1
+        while current_page <= max_pages:
+            logger.debug(f"Scraping page {current_page}...")
+            
+            # Extract results from current page
+            page_results = self.extract_results_from_page(driver, current_page)
+            
+            if not page_results:
+                logger.debug(f"No results found on page {current_page}")
+                break
+            
+            # Update position numbers to be continuous across pages
+            for result in page_results:
+                result["position"] = len(all_results) + 1
+                result["query"] = query
+                all_results.append(result)
+            
+            logger.debug(f"Found {len(page_results)} results on page {current_page}")
+            
+            # Try to navigate to next page if not on last requested page
+            if current_page < max_pages:
+                if not self.navigate_to_next_page(driver):
+                    logger.debug(f"Could not navigate to page {current_page + 1}, stopping pagination")
+                    break
                 
-                return {
-                    "query": query,
-                    "pages_scraped": current_page - 1,
-                    "total_results": len(all_results),
-                    "base_search_url": search_url,
-                    "results": all_results
-                }
+                # Wait a bit between page requests to be respectful
+                time.sleep(1)
             
+            current_page += 1
+        
+        return {
+            "query": query,
+            "pages_scraped": current_page - 1,
+            "total_results": len(all_results),
+            "base_search_url": search_url,
+            "results": all_results
+        }
+
+    def search_duckduckgo(self, query, max_pages=3):
+        """Search DuckDuckGo and extract results from multiple pages"""
+        try:
+            # Borrow a dedicated tab so concurrent requests don't share one
+            return self.browser_manager.run_in_tab(lambda driver: self.scrape_pages(driver, query, max_pages))
+        except queue.Empty:
+            return {"error": "No browser tab became available", "query": query}
         except Exception as e:
             return {"error": f"Search failed: {str(e)}", "query": query}
 
+class DuckDuckGoHTMLScraper:
+    """Search DuckDuckGo through its static HTML endpoint, without a browser"""
+    search_endpoint = "https://html.duckduckgo.com/html/"
+    results_per_page = 30
+
+    def resolve_result_url(self, href):
+        """Unwrap DuckDuckGo's //duckduckgo.com/l/?uddg=... redirect links"""
+        url = urljoin(self.search_endpoint, href)
+        parsed = urlparse(url)
+        if parsed.path == '/l/':
+            target = parse_qs(parsed.query).get('uddg')
+            if target:
+                return target[0]
+        return url
+
+    def extract_results(self, html, page_num):
+        """Extract search results from one HTML endpoint page, or None if it is a CAPTCHA"""
+        tree = LexborHTMLParser(html)
+        if tree.css_first('.anomaly-modal__title, #challenge-form') is not None:
+            return None
+
+        results = []
+        for result in tree.css('.result'):
+            # Skip sponsored results
+            if 'result--ad' in (result.attributes.get('class') or ''):
+                continue
+
+            title_element = result.css_first('.result__title a, .result__a')
+            if title_element is None:
+                continue
+            title = node_text(title_element)
+            href = title_element.attributes.get('href')
+            if not title or not href:
+                continue
+            url = self.resolve_result_url(href)
+
+            snippet_element = result.css_first('.result__snippet')
+            snippet = node_text(snippet_element) if snippet_element is not None else ""
+
+            results.append({
+                "position": len(results) + 1,
+                "page": page_num,
+                "title": title,
+                "url": url,
+                "base_url": DuckDuckGoScraper.extract_base_url(url),
+                "snippet": snippet
+            })
+        return results
+
+    async def fetch_pages(self, query, max_pages):
+        """Fetch all requested result pages concurrently"""
+        headers = {'User-Agent': USER_AGENT}
+        async with httpx.AsyncClient(http2=True, headers=headers, timeout=15, follow_redirects=True) as client:
+            requests = [
+                client.get(self.search_endpoint, params={'q': query, 's': page * self.results_per_page})
+                for page in range(max_pages)
+            ]
+            # Keep per-page failures in the list so earlier pages survive a later failure
+            return await asyncio.gather(*requests, return_exceptions=True)
+
+    def search_duckduckgo(self, query, max_pages=3):
+        """Search DuckDuckGo over HTTP, returning None when the browser scraper should be used instead"""
+        clean_query = query.replace('\"','')
+        try:
+            responses = asyncio.run(self.fetch_pages(clean_query, max_pages))
+        except httpx.HTTPError as e:
+            logger.warning(f"HTML endpoint request failed: {e}")
+            return None
+
+        all_results = []
+        pages_scraped = 0
+        for page_num, response in enumerate(responses, start=1):
+            # Transport errors, non-200 responses and CAPTCHA pages all end pagination here
+            page_results = None
+            if isinstance(response, BaseException):
+                if not isinstance(response, httpx.HTTPError):
+                    raise response
+                logger.warning(f"HTML endpoint request failed on page {page_num}: {response}")
+            elif response.status_code == 200:
+                page_results = self.extract_results(response.text, page_num)
+                if page_results is None:
+                    logger.warning(f"HTML endpoint served a CAPTCHA on page {page_num}")
+            else:
+                logger.warning(f"HTML endpoint blocked page {page_num} (status {response.status_code})")
+            if page_results is None:
+                if page_num == 1:
+                    return None
+                break
+            if not page_results:
+                break
+
+            # Update position numbers to be continuous across pages
+            for result in page_results:
+                result["position"] = len(all_results) + 1
+                result["query"] = query
+                all_results.append(result)
+            pages_scraped = page_num
+
+        return {
+            "query": query,
+            "pages_scraped": pages_scraped,
+            "total_results": len(all_results),
+            "base_search_url": f"{self.search_endpoint}?q={quote_plus(clean_query)}",
+            "results": all_results
+        }
+
+def get_parse_pool(broken=None):
+    """Return the pool of parse worker processes, creating it on first use or replacing a broken one"""
+    global parse_pool
+    with parse_pool_lock:
+        if parse_pool is not None and parse_pool is broken:
+            logger.warning("Parse worker died, rebuilding the parse pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            parse_pool = None
+        if parse_pool is None:
+            # Parse workers are spawned, not forked, so they never inherit the server's threads;
+            # they re-import this module, which creates no pool and starts no browser until used
+            parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context('spawn'))
+        return parse_pool
+
+def clean_in_worker(html):
+    """Parse and clean a page in the worker pool, rebuilding the pool if a worker died"""
+    pool = get_parse_pool()
+    try:
+        return pool.submit(parse_and_clean, html).result(timeout=PARSE_TIMEOUT)
+    except BrokenProcessPool:
+        # A dead worker (e.g. OOM-killed on a huge page) breaks the whole pool for good
+        return get_parse_pool(broken=pool).submit(parse_and_clean, html).result(timeout=PARSE_TIMEOUT)
+
 # Initialize global instances
+parse_pool = None  # Created by the first /scrape that needs cleaning
+parse_pool_lock = threading.Lock()  # Serializes creating and rebuilding the parse pool
 browser_manager = SingleBrowserManager()
 search_scraper = DuckDuckGoScraper(browser_manager)
+html_search_scraper = DuckDuckGoHTMLScraper()
 
 @app.route('/search', methods=['GET', 'POST'])
 def search_duckduckgo():
@@ -555,8 +973,11 @@ def search_duckduckgo():
         
         logger.info(f"Starting DuckDuckGo search for: {query}, pages: {max_pages}")
         
-        # Perform search using enhanced method
-        results = search_scraper.search_duckduckgo(query.strip(), max_pages)
+        # Perform search over the HTML endpoint, falling back to the browser when it is blocked
+        results = html_search_scraper.search_duckduckgo(query.strip(), max_pages)
+        if results is None:
+            logger.info("HTML endpoint unavailable, falling back to browser search")
+            results = search_scraper.search_duckduckgo(query.strip(), max_pages)
         
         # Return results
         if "error" in results:
@@ -585,37 +1006,47 @@ def scrape_url():
         if not parsed.scheme or not parsed.netloc:
             return jsonify({'error': 'Invalid URL format'}), 400
         
+        # Cleaned content by default, or the raw <body> markup without any parsing
+        mode = request.args.get('mode', 'cleaned')
+        if mode not in SCRAPE_MODES:
+            return jsonify({'error': f"Invalid mode, expected one of: {', '.join(SCRAPE_MODES)}"}), 400
+        
+        # Stylesheets, fonts and media are blocked unless the caller needs the full page
+        # (images stay disabled browser-wide by --blink-settings)
+        block_resources = request.args.get('block_resources', 'true').lower() != 'false'
+        
         logger.info(f"Scraping URL: {url}")
         
-        driver = browser_manager.get_driver()
-        if not driver:
-            return jsonify({'error': 'Browser driver is not available'}), 500
+        # A pattern matching the page's own URL (e.g. *.gif for www.gifts.com) would block the page itself
+        adjust_blocking = not block_resources or any(url_matches_pattern(url, pattern) for pattern in BLOCKED_URL_PATTERNS)
         
-        try:
-            # Use thread lock to ensure thread safety
-            with browser_manager.lock:
+        def load_page(driver):
+            if adjust_blocking:
+                browser_manager.set_resource_blocking(driver, block_resources, page_url=url)
+            try:
                 driver.get(url)
                 # Wait for page to load
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-                # Additional wait for dynamic content
-                time.sleep(2)
-                html = driver.page_source
+                wait_for_page_load(driver)
+                return driver.page_source
+            finally:
+                if adjust_blocking:
+                    browser_manager.set_resource_blocking(driver, True)
+        
+        try:
+            # Borrow a dedicated tab so concurrent requests don't share one
+            html = browser_manager.run_in_tab(load_page)
+        except queue.Empty:
+            return jsonify({'error': 'No browser tab became available'}), 503
         except Exception as e:
             return jsonify({'error': f'Failed to load URL: {str(e)}'}), 400
 
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # Remove <script> and <style> tags
-        for tag in soup(['script', 'style']):
-            tag.decompose()
+        if mode == 'raw_body':
+            output_html = slice_body(html)
+            logger.info(f"Successfully scraped raw body of {url} - Content length: {len(output_html)}")
+            return Response(output_html, content_type='text/html; charset=utf-8')
 
-        body = soup.body or soup
-        cleaned = clean_tag(body)
-
-        # If cleaned is None, return empty string
-        output_html = str(cleaned) if cleaned else ''
+        # Parse and clean in a worker process so the GIL-bound work doesn't stall other requests
+        output_html = clean_in_worker(html)
 
         logger.info(f"Successfully scraped and cleaned {url} - Content length: {len(output_html)}")
 
@@ -634,13 +1065,15 @@ def scrape_url():
 def status():
     """Check if the browser is running and healthy"""
     try:
-        driver = browser_manager.get_driver()
-        if driver and browser_manager.is_healthy():
-            current_url = driver.current_url
+        if not browser_manager.is_healthy():
+            logger.warning("Browser is unhealthy, attempting restart...")
+            browser_manager.restart_driver()
+        if browser_manager.is_healthy():
             return jsonify({
                 'status': 'healthy',
                 'browser_active': True,
-                'current_url': current_url
+                'tabs': len(browser_manager.sessions),
+                'idle_tabs': browser_manager.tabs.qsize()
             })
         else:
             return jsonify({
@@ -688,11 +1121,11 @@ def home():
     doc = {
         "name": "Flask Selenium Scraper API",
         "version": "4.0.0",
-        "description": "API for DuckDuckGo search and web scraping using a single shared Selenium browser instance",
+        "description": "API for DuckDuckGo search and web scraping using a single shared Selenium browser instance with a pool of tabs",
         "endpoints": {
             "/search": {
                 "methods": ["GET", "POST"],
-                "description": "Search DuckDuckGo with enhanced pagination and result extraction",
+                "description": "Search DuckDuckGo through its HTML endpoint, falling back to the browser with enhanced pagination when blocked",
                 "parameters": {
                     "query": "Search query string (supports quotes and special characters)",
                     "max_pages": "Maximum number of pages to scrape (default: 3, max: 10)"
@@ -712,13 +1145,18 @@ def home():
                 "methods": ["GET"],
                 "description": "Scrape a URL and return cleaned HTML content (removes scripts, styles, and cleans structure)",
                 "parameters": {
-                    "url": "URL to scrape"
+                    "url": "URL to scrape",
+                    "mode": "'cleaned' (default) for cleaned content, or 'raw_body' for the unparsed <body> markup",
+                    "block_resources": "Block stylesheets, fonts and media files while loading (default: true); images are always disabled"
                 },
-                "example": "/scrape?url=https://example.com"
+                "examples": {
+                    "cleaned": "/scrape?url=https://example.com",
+                    "raw_body": "/scrape?url=https://example.com&mode=raw_body"
+                }
             },
             "/status": {
                 "methods": ["GET"],
-                "description": "Check browser health and status"
+                "description": "Check browser health and tab pool status"
             },
             "/restart": {
                 "methods": ["POST"],
@@ -731,13 +1169,14 @@ def home():
         },
         "features": [
             "Single shared browser instance for all operations",
-            "Thread-safe browser access with locking",
-            "Enhanced DuckDuckGo search with multiple pagination methods",
-            "Cleaned HTML scraping with meaningful content extraction",
+            "Pool of browser tabs over the Chrome DevTools Protocol for concurrent requests",
+            "Browserless DuckDuckGo search over the HTML endpoint with concurrent page fetches",
+            "Enhanced browser-based DuckDuckGo search with multiple pagination methods as a fallback",
+            "Cleaned HTML scraping with meaningful content extraction, parsed in a pool of worker processes",
             "Automatic browser health checks and restart capabilities",
             "Comprehensive error handling and logging"
         ],
-        "architecture": "Uses a single Chrome browser instance shared across all endpoints with thread-safe locking"
+        "architecture": "Uses a single Chrome browser instance shared across all endpoints over CDP, with one WebDriver session per tab borrowed from a thread-safe pool"
     }
     return jsonify(doc), 200
 
@@ -748,13 +1187,19 @@ def handle_exception(e):
 
 # Cleanup on app shutdown
 def cleanup():
+    # Parse workers import this module too, but own no browser or pool
+    if multiprocessing.parent_process() is not None:
+        return
     logger.info("Shutting down browser manager...")
     browser_manager.close()
+    if parse_pool is not None:
+        parse_pool.shutdown(wait=False, cancel_futures=True)
 
 atexit.register(cleanup)
 
 if __name__ == '__main__':
     logger.info("Starting Flask Selenium Scraper API with Single Browser Instance")
+    browser_manager.setup_driver()
     logger.info("Browser instance initialized and ready")
     logger.info("Available endpoints:")
     logger.info("- GET/POST /search")